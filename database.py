@@ -1,8 +1,17 @@
 # database.py
 import sqlite3
 
+DB_PATH = 'users.db'
+
+def _connect():
+    conn = sqlite3.connect(DB_PATH)
+    # WAL lets logins (reads) proceed while a registration commits, so
+    # multiple workers can share the file without blocking each other.
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
 def init_db():
-    conn = sqlite3.connect('users.db')
+    conn = _connect()
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -15,8 +24,16 @@ def init_db():
     conn.close()
 
 def add_user(username, password):
-    conn = sqlite3.connect('users.db')
+    conn = _connect()
     c = conn.cursor()
     c.execute('INSERT INTO users (username, password) VALUES (?, ?)', (username, password))
     conn.commit()
-    conn.close()
\ No newline at end of file
+    conn.close()
+
+def get_user_password(username):
+    conn = _connect()
+    c = conn.cursor()
+    c.execute('SELECT password FROM users WHERE username = ?', (username,))
+    row = c.fetchone()
+    conn.close()
+    return row[0] if row else None
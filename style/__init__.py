@@ -0,0 +1,245 @@
+# Application factory shared by both entry points. app.py serves the
+# authenticated variant, appp.py the open one; keeping a single factory
+# means the module-level Gemini/DDGS handles and caches in style.llm
+# are set up exactly once no matter which entry point is loaded.
+from flask import Flask, render_template, request, redirect, url_for, session, flash, Response, stream_with_context
+from werkzeug.security import generate_password_hash, check_password_hash
+from flask_caching import Cache
+from jinja2 import FileSystemBytecodeCache
+import asyncio
+import os
+import logging
+import orjson
+
+from database import init_db, add_user, get_user_password
+from .llm import (
+    FALLBACK_ACCESSORIES,
+    FALLBACK_DESCRIPTION,
+    GEMINI_API_KEY,
+    MODEL,
+    _cache_key,
+    _cache_put,
+    _description_prompt,
+    _exact_cache,
+    _page_cache_get,
+    _page_cache_put,
+    construct_query,
+    fetch_accessory_images,
+    generate_accessories,
+    generate_description,
+    generate_recommendation_bundle,
+    get_placeholder_image,
+    refine_query_gemini,
+    scrape_duckduckgo_images,
+)
+
+# Logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Templates live at the repository root, not inside this package.
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+
+def create_app(auth=True):
+    app = Flask(__name__, template_folder=TEMPLATE_FOLDER)
+    app.secret_key = os.urandom(24).hex()
+
+    # Page cache for the static GET views, plus a Jinja bytecode cache
+    # so template compilation survives worker restarts.
+    cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+    if auth:
+        # User records live in sqlite (users.db) so every worker sees
+        # the same accounts. Stored passwords are hashes, never
+        # plaintext.
+        init_db()
+
+        @app.route('/')
+        def home():
+            if 'user' in session:
+                return render_template('index.html')
+            return redirect(url_for('login'))
+
+        @app.route('/login', methods=['GET', 'POST'])
+        def login():
+            if request.method == 'POST':
+                username = request.form['username']
+                password = request.form['password']
+                stored_hash = get_user_password(username)
+                if stored_hash is not None and check_password_hash(stored_hash, password):
+                    session['user'] = username
+                    return redirect(url_for('home'))
+                flash("Invalid credentials", "danger")
+            return render_template('login.html')
+
+        @app.route('/register', methods=['GET', 'POST'])
+        def register():
+            if request.method == 'POST':
+                username = request.form['username']
+                password = request.form['password']
+                if get_user_password(username) is not None:
+                    flash("Username already exists", "warning")
+                else:
+                    add_user(username, generate_password_hash(password))
+                    flash("Registration successful! Please log in.", "success")
+                    return redirect(url_for('login'))
+            return render_template('register.html')
+
+        @app.route('/logout')
+        def logout():
+            session.pop('user', None)
+            return redirect(url_for('login'))
+    else:
+        @app.route('/')
+        @cache.cached(timeout=300)
+        def index():
+            return render_template('index.html')
+
+    def _require_login():
+        if auth and 'user' not in session:
+            return redirect(url_for('login'))
+        return None
+
+    # Style Recommender Routes
+
+    @app.route('/recommend', methods=['POST'])
+    async def recommend():
+        denied = _require_login()
+        if denied is not None:
+            return denied
+
+        user_preferences = {
+            "color": request.form.get('color', '').strip(),
+            "gender": request.form.get('gender', '').strip(),
+            "type": request.form.get('type', '').strip(),
+            "occasion": request.form.get('occasion', '').strip(),
+            "style": request.form.get('style', '').strip()
+        }
+
+        raw_query = construct_query(user_preferences)
+        logger.info(f"Raw query: {raw_query}")
+
+        accessory_items = request.form.getlist('accessory_items') if 'accessory_items' in request.form else []
+
+        # Repeat submissions of the same preferences render the same
+        # page; serve the cached html and skip all LLM and scraping work.
+        page_key = _cache_key("page", user_preferences['color'], user_preferences['gender'],
+                              user_preferences['type'], user_preferences['occasion'],
+                              user_preferences['style'], *sorted(accessory_items))
+        cached_page = _page_cache_get(page_key)
+        if cached_page is not None:
+            return cached_page
+
+        # Answer all three prompts with a single coalesced Gemini call
+        # when possible; one round-trip instead of three.
+        bundle = await generate_recommendation_bundle(raw_query, user_preferences, accessory_items) if GEMINI_API_KEY else None
+
+        if bundle is not None:
+            refined_query, description, accessories_response = bundle
+            logger.info(f"Refined query: {refined_query}")
+            image_urls = await asyncio.to_thread(scrape_duckduckgo_images, refined_query)
+        else:
+            # Fall back to the per-prompt calls, still dispatched
+            # together; accessories works from the raw query so it
+            # doesn't have to wait for the refinement round-trip.
+            refine_task = asyncio.create_task(refine_query_gemini(raw_query)) if GEMINI_API_KEY else None
+            description_task = asyncio.create_task(generate_description(user_preferences))
+            accessories_task = asyncio.create_task(
+                generate_accessories(raw_query, user_preferences['gender'], accessory_items)) if accessory_items else None
+
+            refined_query = await refine_task if refine_task else raw_query
+            logger.info(f"Refined query: {refined_query}")
+
+            # DDGS has no async client, so push the scrape onto a thread.
+            image_urls = await asyncio.to_thread(scrape_duckduckgo_images, refined_query)
+            description = await description_task
+            accessories_response = await accessories_task if accessories_task else None
+
+        html = render_template(
+            'recommendation.html',
+            query=refined_query,
+            image_urls=image_urls,
+            description=description,
+            preferences=orjson.dumps(user_preferences).decode(),
+            accessories_response=accessories_response
+        )
+        # Only successful renders stick: a page built from the stock
+        # description/accessories fallbacks or placeholder images after
+        # a transient Gemini/DDG failure must not be served for the
+        # full TTL.
+        if (description != FALLBACK_DESCRIPTION
+                and accessories_response != FALLBACK_ACCESSORIES
+                and get_placeholder_image() not in image_urls):
+            _page_cache_put(page_key, html)
+        return html
+
+    @app.route('/describe-stream')
+    def describe_stream():
+        """Stream the fashion description as server-sent events so the
+        page can paint it chunk by chunk instead of waiting on the full
+        Gemini completion. The template consumes this with an
+        EventSource."""
+        denied = _require_login()
+        if denied is not None:
+            return denied
+
+        prefs = {field: request.args.get(field, '').strip()
+                 for field in ('color', 'gender', 'type', 'occasion', 'style')}
+
+        def sse():
+            key = _cache_key("describe", prefs.get('color'), prefs.get('gender'),
+                             prefs.get('type'), prefs.get('occasion'), prefs.get('style'))
+            cached = _exact_cache.get(key)
+            if cached is not None:
+                yield f"data: {orjson.dumps(cached).decode()}\n\n"
+            else:
+                chunks = []
+                try:
+                    response = MODEL.generate_content(_description_prompt(prefs), stream=True)
+                    for chunk in response:
+                        if chunk.text:
+                            chunks.append(chunk.text)
+                            yield f"data: {orjson.dumps(chunk.text).decode()}\n\n"
+                    if chunks:
+                        _cache_put(key, "".join(chunks).strip())
+                except Exception as e:
+                    logger.error(f"Description streaming failed: {e}")
+                    if not chunks:
+                        yield f"data: {orjson.dumps(FALLBACK_DESCRIPTION).decode()}\n\n"
+            yield "event: done\ndata: \n\n"
+
+        return Response(stream_with_context(sse()), mimetype='text/event-stream')
+
+    @app.route('/ask-accessories', methods=['POST'])
+    def ask_accessories():
+        prefs = request.form.get('preferences')
+        return render_template("ask_accessories.html", preferences=prefs)
+
+    @app.route('/accessories', methods=['POST'])
+    async def accessories():
+        try:
+            prefs = orjson.loads(request.form.get('preferences', '{}'))
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse preferences JSON: {e}")
+            prefs = {}
+
+        items = request.form.getlist('items')
+        outfit_desc = construct_query(prefs)
+        gender = prefs.get("gender", "unisex")
+
+        # The Gemini call and the per-item image lookups are
+        # independent; run them all under one gather.
+        text, accessory_images = await asyncio.gather(
+            generate_accessories(outfit_desc, gender, items),
+            fetch_accessory_images(items))
+
+        return render_template(
+            "accessories.html",
+            outfit=outfit_desc,
+            accessories=text,
+            accessory_images=accessory_images
+        )
+
+    return app
@@ -0,0 +1,327 @@
+# Shared Gemini + DuckDuckGo helpers used by both app entry points.
+import asyncio
+import functools
+import math
+import os
+import logging
+import threading
+import time
+from collections import defaultdict
+from itertools import islice
+import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from duckduckgo_search import DDGS
+from dotenv import load_dotenv
+import json
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Gemini API Configuration
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+if GEMINI_API_KEY:
+    try:
+        genai.configure(api_key=GEMINI_API_KEY)
+    except Exception as e:
+        logger.error(f"Gemini API setup failed: {e}")
+
+# Shared clients. The model handle is stateless, so build it once at
+# import instead of per call. DDGS keeps connection state and is not
+# thread-safe, so the image helpers get one instance per thread rather
+# than a fresh session (and TLS handshake) per request.
+MODEL = genai.GenerativeModel('gemini-1.5-flash-latest')
+_thread_local = threading.local()
+
+def get_ddgs():
+    if not hasattr(_thread_local, "ddgs"):
+        _thread_local.ddgs = DDGS()
+    return _thread_local.ddgs
+
+# Request constants, built once at import instead of per call.
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+}
+REFINE_GENERATION_CONFIG = genai.types.GenerationConfig(max_output_tokens=60, temperature=0.5)
+JSON_GENERATION_CONFIG = genai.types.GenerationConfig(response_mime_type="application/json")
+
+# Gemini response cache
+#
+# Preference tuples repeat heavily (color x gender x type x occasion x
+# style is a small space), so identical prompts were hitting Gemini on
+# every request. Exact tier: dict keyed on canonicalized inputs.
+# Semantic tier (refine only): reuse an answer when the query embedding
+# is nearly identical to one already seen.
+
+GEMINI_CACHE_MAX = 2048
+SEMANTIC_CACHE_MAX = 512
+SEMANTIC_SIMILARITY_THRESHOLD = 0.92
+
+PAGE_CACHE_MAX = 256
+PAGE_CACHE_TTL = 3600
+
+_exact_cache = {}
+_semantic_cache = []  # (embedding, response) pairs
+_page_cache = {}  # key -> (stored_at, rendered html)
+
+def _cache_key(*parts):
+    return tuple(str(p).strip().lower() for p in parts)
+
+def _cache_put(key, value):
+    if len(_exact_cache) >= GEMINI_CACHE_MAX:
+        _exact_cache.pop(next(iter(_exact_cache)))
+    _exact_cache[key] = value
+
+def _page_cache_get(key):
+    entry = _page_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, html = entry
+    if time.time() - stored_at > PAGE_CACHE_TTL:
+        del _page_cache[key]
+        return None
+    return html
+
+def _page_cache_put(key, html):
+    if len(_page_cache) >= PAGE_CACHE_MAX:
+        _page_cache.pop(next(iter(_page_cache)))
+    _page_cache[key] = (time.time(), html)
+
+def _embed_query(text):
+    try:
+        result = genai.embed_content(model="models/text-embedding-004", content=text)
+        return result["embedding"]
+    except Exception as e:
+        logger.error(f"Query embedding failed: {e}")
+        return None
+
+def _cosine_similarity(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+def _semantic_lookup(vec):
+    best, best_similarity = None, 0.0
+    for other_vec, response in _semantic_cache:
+        similarity = _cosine_similarity(vec, other_vec)
+        if similarity > best_similarity:
+            best, best_similarity = response, similarity
+    return best if best_similarity >= SEMANTIC_SIMILARITY_THRESHOLD else None
+
+def _semantic_put(vec, response):
+    if len(_semantic_cache) >= SEMANTIC_CACHE_MAX:
+        _semantic_cache.pop(0)
+    _semantic_cache.append((vec, response))
+
+# Helper functions
+
+@functools.lru_cache(maxsize=1024)
+def _construct_query(color, style, outfit_type, occasion, gender):
+    return " ".join(part for part in (
+        color,
+        style,
+        outfit_type,
+        f"for {occasion}" if occasion else "",
+        gender
+    ) if part)
+
+def construct_query(prefs):
+    # The same prefs dict is rebuilt into a query more than once per
+    # flow, so the real work is memoized on the five known fields.
+    return _construct_query(prefs.get('color'), prefs.get('style'),
+                            prefs.get('type'), prefs.get('occasion'),
+                            prefs.get('gender'))
+
+async def refine_query_gemini(raw_query):
+    # Refinement only ever trims the query to 8 keywords, so when the
+    # raw query is already within budget the LLM call is wasted latency
+    # and cost.
+    tokens = raw_query.split()
+    if len(tokens) <= 8:
+        return " ".join(tokens)
+
+    key = _cache_key("refine", raw_query)
+    cached = _exact_cache.get(key)
+    if cached is not None:
+        return cached
+
+    vec = await asyncio.to_thread(_embed_query, raw_query)
+    if vec is not None:
+        hit = _semantic_lookup(vec)
+        if hit is not None:
+            _cache_put(key, hit)
+            return hit
+
+    try:
+        prompt = f"Refine the following fashion query for concise image search (max 8 keywords). Output ONLY the refined query: \"{raw_query}\""
+
+        response = await MODEL.generate_content_async(
+            prompt,
+            generation_config=REFINE_GENERATION_CONFIG,
+            safety_settings=SAFETY_SETTINGS
+        )
+
+        if not response.candidates:
+            return raw_query
+
+        refined = response.text.strip()
+        refined = " ".join(islice(refined.split(maxsplit=8), 8)) or raw_query
+        _cache_put(key, refined)
+        if vec is not None:
+            _semantic_put(vec, refined)
+        return refined
+
+    except Exception as e:
+        logger.error(f"Gemini refinement failed: {e}")
+        return raw_query
+
+# Stock strings returned when a Gemini call fails; callers use these to
+# tell a fallback apart from a real response.
+FALLBACK_DESCRIPTION = "A stylish look for your preferences."
+FALLBACK_ACCESSORIES = "Some matching accessories to enhance your look beautifully!"
+
+DESC_PROMPT = (
+    "Generate a 4-5 line fashion description based on the following preferences:\n"
+    "Color: {color}, Gender: {gender}, Type: {type}, Occasion: {occasion}, Style: {style}.\n"
+    "Write a friendly paragraph, no bullets."
+)
+
+def _description_prompt(prefs):
+    # One constant format string instead of rebuilding the prompt from
+    # five f-string pieces; the defaultdict fills absent fields as 'any'.
+    return DESC_PROMPT.format_map(defaultdict(lambda: "any", prefs))
+
+async def generate_description(prefs):
+    key = _cache_key("describe", prefs.get('color'), prefs.get('gender'),
+                     prefs.get('type'), prefs.get('occasion'), prefs.get('style'))
+    cached = _exact_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        response = await MODEL.generate_content_async(_description_prompt(prefs))
+        if not response.candidates:
+            return FALLBACK_DESCRIPTION
+        description = response.text.strip()
+        _cache_put(key, description)
+        return description
+    except Exception as e:
+        logger.error(f"Failed to generate description: {e}")
+        return FALLBACK_DESCRIPTION
+
+async def generate_accessories(outfit_desc, gender, items):
+    key = _cache_key("accessories", outfit_desc, gender, *sorted(items))
+    cached = _exact_cache.get(key)
+    if cached is not None:
+        return cached
+    prompt = (
+        f"Suggest fashionable matching accessories for this outfit:\n"
+        f"Outfit: {outfit_desc}\n"
+        f"Gender: {gender}\n"
+        f"Requested Accessories: {', '.join(items)}\n\n"
+        "Write a friendly paragraph that recommends stylish matching accessories. "
+        "Include why they go well with the outfit. Keep it elegant and fashion-focused."
+    )
+    try:
+        response = await MODEL.generate_content_async(prompt)
+        text = response.text.strip()
+        _cache_put(key, text)
+        return text
+    except Exception as e:
+        logger.error(f"Accessory generation failed: {e}")
+        return FALLBACK_ACCESSORIES
+
+async def generate_recommendation_bundle(raw_query, prefs, items):
+    """Answer the refine, describe, and accessorize prompts in a single
+    Gemini round-trip instead of three. Returns (refined_query,
+    description, accessories_response) or None so callers can fall back
+    to the per-prompt path when the combined call fails."""
+    # Key on the five preference fields, not the joined query: distinct
+    # pref dicts can join to the same raw_query but need different
+    # descriptions.
+    key = _cache_key("bundle", prefs.get('color'), prefs.get('gender'),
+                     prefs.get('type'), prefs.get('occasion'), prefs.get('style'),
+                     *sorted(items))
+    cached = _exact_cache.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = (
+        "You are helping a fashion recommendation app. Complete the three tasks below "
+        "and reply with ONLY a JSON object with string keys \"refined_query\", "
+        "\"description\" and \"accessories\".\n"
+        f"1. refined_query: refine this fashion query for concise image search (max 8 keywords): \"{raw_query}\"\n"
+        f"2. description: a friendly 4-5 line fashion description for these preferences, no bullets: "
+        f"Color: {prefs.get('color', 'any')}, Gender: {prefs.get('gender', 'any')}, "
+        f"Type: {prefs.get('type', 'any')}, Occasion: {prefs.get('occasion', 'any')}, Style: {prefs.get('style', 'any')}.\n"
+    )
+    if items:
+        prompt += (
+            f"3. accessories: a friendly, elegant paragraph recommending these matching accessories "
+            f"for the outfit and why they go well with it: {', '.join(items)}.\n"
+        )
+    else:
+        prompt += "3. accessories: an empty string.\n"
+
+    try:
+        response = await MODEL.generate_content_async(
+            prompt,
+            generation_config=JSON_GENERATION_CONFIG
+        )
+        if not response.candidates:
+            return None
+        parsed = json.loads(response.text)
+        refined = " ".join(str(parsed.get("refined_query", "")).split()[:8]) or raw_query
+        description = str(parsed.get("description", "")).strip()
+        if not description:
+            return None
+        accessories_text = str(parsed.get("accessories", "")).strip() or None
+        bundle = (refined, description, accessories_text)
+        _cache_put(key, bundle)
+        return bundle
+    except Exception as e:
+        logger.error(f"Combined Gemini call failed: {e}")
+        return None
+
+def get_placeholder_image():
+    return "https://via.placeholder.com/400x500.png?text=Image+Not+Found"
+
+def scrape_duckduckgo_images(query, max_images=5):
+    try:
+        # Ask DDG for one result of slack instead of double, and stop
+        # consuming its generator the moment we have enough valid URLs.
+        results = get_ddgs().images(keywords=query, region="wt-wt", safesearch="moderate", layout="square", max_results=max_images + 1)
+        images = list(islice(
+            (result["image"] for result in results
+             if isinstance(result.get("image"), str) and result["image"].startswith("http")),
+            max_images))
+        return images if images else [get_placeholder_image()] * max_images
+    except Exception as e:
+        logger.error(f"Image scraping failed: {e}")
+        return [get_placeholder_image()] * max_images
+
+def _fetch_one_accessory_image(item):
+    # Runs on a worker thread; get_ddgs hands each thread its own session.
+    try:
+        results = get_ddgs().images(keywords=f"{item} accessory", region="wt-wt", safesearch="moderate", layout="square", max_results=1)
+        for result in results:
+            image_url = result.get("image")
+            if image_url:
+                return image_url
+    except Exception as e:
+        logger.error(f"Accessory image fetching failed for '{item}': {e}")
+    return None
+
+async def fetch_accessory_images(accessories_list):
+    """Fetch one image per accessory concurrently. DDGS has no async
+    client, so each lookup runs in its own worker thread under the
+    event loop instead of a dedicated executor."""
+    if not accessories_list:
+        return {}
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_fetch_one_accessory_image, item) for item in accessories_list))
+    return {item: url for item, url in zip(accessories_list, results) if url}